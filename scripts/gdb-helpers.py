@@ -14,26 +14,168 @@ Usage:
 """
 
 import gdb
+import json
+import re
 import struct
 
 
+# Matches the base/limit pair in `info registers idtr|gdtr` output,
+# compiled once at load instead of per invocation.
+_DTR_RE = re.compile(r'base=(0x[0-9a-fA-F]+).*limit=(0x[0-9a-fA-F]+)')
+
+
+# Page-table walk levels: name, shift of the level's index within the
+# virtual address, and the offset mask plus label when the entry maps a
+# huge page at this level (PS bit; only valid at PDPT and PD).
+_PT_LEVELS = (
+    ("PML4", 39, None, None),
+    ("PDPT", 30, 0x3FFFFFFF, "1GB"),
+    ("PD", 21, 0x1FFFFF, "2MB"),
+    ("PT", 12, None, None),
+)
+
+
+def _hex64(value):
+    """Format a 64-bit value as 0x-prefixed hex via the C-level bytes.hex()
+
+    Noticeably faster than the #018x formatter for 16-digit numbers; used
+    on the machine-readable output paths where the volume is highest. The
+    pretty printers keep the padded f-string formatting.
+    """
+    return "0x" + value.to_bytes(8, "big").hex()
+
+
+# IDT gate type field values with architectural meaning.
+_GATE_TYPE_NAMES = {
+    0xE: "Interrupt",
+    0xF: "Trap",
+}
+
+
+def _parse_idt_entry(buf, index):
+    """Decode one 16-byte IDT gate into (offset, selector, type, dpl, ist)"""
+    (offset_low, selector, ist_byte, type_attr,
+     offset_mid, offset_high) = struct.unpack_from("<HHBBHI", buf, index * 16)
+
+    # Construct full offset
+    offset = (offset_high << 32) | (offset_mid << 16) | offset_low
+
+    # Parse type and attributes
+    dpl = (type_attr >> 5) & 0x3
+    gate_type = type_attr & 0xF
+    gate_type_name = _GATE_TYPE_NAMES.get(gate_type, f"Unknown({gate_type:#x})")
+
+    return offset, selector, gate_type_name, dpl, ist_byte & 0x7
+
+
+# The gate decode above is the hottest pure-Python loop left once the
+# tables are bulk-read. A compiled accelerator (e.g. a Cython build of the
+# same function) can replace it by providing parse_idt_entry in a
+# _gdb_helpers_fast module on sys.path; none is shipped with the tree, as
+# profiling after the bulk-read rewrite shows remote I/O, not parsing,
+# dominates.
+try:
+    from _gdb_helpers_fast import parse_idt_entry as _parse_idt_entry  # noqa: F811
+except ImportError:
+    pass
+
+
+# Page table entry flag bits, in display order.
+_PTE_FLAGS = (
+    (0x1, "P"),                  # Present
+    (0x2, "W"),                  # Writable
+    (0x4, "U"),                  # User
+    (0x8, "PWT"),                # Write-Through
+    (0x10, "PCD"),               # Cache Disable
+    (0x20, "A"),                 # Accessed
+    (0x40, "D"),                 # Dirty
+    (0x80, "PS"),                # Page Size
+    (0x100, "G"),                # Global
+    (0x8000000000000000, "NX"),  # No Execute
+)
+
+
+class _KernelState:
+    """Per-stop cache of target state shared by all commands
+
+    dump-pagetable, dump-idt and dump-gdt are typically issued
+    back-to-back at a single stop and read overlapping state (CR3, the
+    descriptor-table registers, and the tables themselves). The first
+    command pays for the remote reads; the rest hit this cache. All
+    fields are dropped whenever the target stops, resumes, or its
+    memory/registers change.
+    """
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self, event=None):
+        # 4 KiB page-table frames keyed by physical base address.
+        self.frames = {}
+        # Descriptor-table registers: "idtr"/"gdtr" -> (base, limit).
+        self.dtrs = {}
+        # Raw descriptor tables keyed by (base, size).
+        self.tables = {}
+        self.cr3 = None
+
+
+_state = _KernelState()
+
+
+def _connect_cache_invalidation():
+    for registry in ("stop", "cont", "memory_changed", "register_changed"):
+        try:
+            getattr(gdb.events, registry).connect(_state.invalidate)
+        except AttributeError:
+            # Older GDBs are missing some event registries; the cache is
+            # still flushed by whichever ones exist.
+            pass
+
+
+_connect_cache_invalidation()
+
+
 class YomiGdbCommand(gdb.Command):
     """Base class for Yomi OS GDB commands"""
 
     def __init__(self, name, command_class=gdb.COMMAND_USER):
         super().__init__(name, command_class)
 
+    def invoke(self, arg, from_tty):
+        """Collect the command's output and emit it with a single write
+
+        Per-line print() calls mean hundreds of tiny writes to GDB's
+        output stream, which is noticeably slow under MI and remote
+        front-ends. Subclasses implement run(arg, out) and append lines;
+        the whole buffer is flushed here in one gdb.write.
+        """
+        out = []
+        try:
+            self.run(arg, out)
+        finally:
+            if out:
+                gdb.write("\n".join(out) + "\n")
+
+    def run(self, arg, out):
+        raise NotImplementedError
+
     def read_u64(self, address):
-        """Read 64-bit unsigned integer from memory"""
+        """Read 64-bit unsigned integer from memory
+
+        Goes through inferior.read_memory rather than parse_and_eval so
+        GDB's expression parser is never involved.
+        """
         try:
-            return int(gdb.parse_and_eval(f"*(unsigned long long *){address:#x}"))
+            buf = gdb.selected_inferior().read_memory(address, 8)
+            return struct.unpack("<Q", buf)[0]
         except gdb.MemoryError:
             return None
 
     def read_u32(self, address):
         """Read 32-bit unsigned integer from memory"""
         try:
-            return int(gdb.parse_and_eval(f"*(unsigned int *){address:#x}"))
+            buf = gdb.selected_inferior().read_memory(address, 4)
+            return struct.unpack("<I", buf)[0]
         except gdb.MemoryError:
             return None
 
@@ -45,12 +187,145 @@ class YomiGdbCommand(gdb.Command):
         except gdb.MemoryError:
             return None
 
+    def read_u64_array(self, address, count):
+        """Read an array of 64-bit unsigned integers with a single memory read
+
+        A bulk read_memory costs one round-trip to the target regardless of
+        count, whereas per-entry reads cost one round-trip each.
+        """
+        try:
+            inferior = gdb.selected_inferior()
+            buf = inferior.read_memory(address, count * 8)
+            return struct.unpack(f"<{count}Q", buf)
+        except gdb.MemoryError:
+            return None
+
+    def read_dtr(self, name, out):
+        """Read a descriptor-table register (idtr/gdtr) as (base, limit)
+
+        Prefers the structured register value over round-tripping
+        `info registers` text through a regex, and caches the result until
+        the target resumes so repeated dumps at one stop are free. Returns
+        None (after appending an error to out) if the register cannot be
+        read or parsed.
+        """
+        cached = _state.dtrs.get(name)
+        if cached is not None:
+            return cached
+
+        base = limit = None
+
+        # Modern GDB exposes idtr/gdtr as a structured value.
+        try:
+            reg = gdb.selected_frame().read_register(name)
+            base = int(reg["base"])
+            limit = int(reg["limit"])
+        except (gdb.error, ValueError, LookupError):
+            pass
+
+        if base is None:
+            try:
+                base = int(gdb.parse_and_eval(f"${name}.base"))
+                limit = int(gdb.parse_and_eval(f"${name}.limit"))
+            except gdb.error:
+                base = None
+
+        if base is None:
+            # Last resort: regex over the `info registers` text output.
+            try:
+                output = gdb.execute(f"info registers {name}", to_string=True)
+            except gdb.error as e:
+                out.append(f"Error reading {name.upper()}: {e}")
+                return None
+
+            # Format: idtr           {base=0x..., limit=0x...}
+            match = _DTR_RE.search(output)
+            if not match:
+                out.append(f"Error: Cannot parse {name.upper()}")
+                out.append(f"{name.upper()} output: {output}")
+                return None
+
+            base = int(match.group(1), 16)
+            limit = int(match.group(2), 16)
+
+        _state.dtrs[name] = (base, limit)
+        return base, limit
+
+    def read_table_bytes(self, address, size):
+        """Read a descriptor table with a temporarily raised packet size
+
+        On gdbserver targets the default memory-read packet size splits a
+        4 KiB table into several packets; raising it for the duration of
+        the bulk read keeps the transfer to a single round-trip. The
+        previous value is restored afterwards, and GDBs without the
+        setting are read normally. Tables are cached per stop so a
+        repeated dump costs no remote traffic at all.
+        """
+        cached = _state.tables.get((address, size))
+        if cached is not None:
+            return cached
+
+        # memory-read-packet-size is registered as a set/show command
+        # pair rather than a parameter, so gdb.parameter cannot see it
+        # (and raises a plain RuntimeError); probe it through the show
+        # command instead.
+        prev = None
+        try:
+            shown = gdb.execute("show remote memory-read-packet-size",
+                                to_string=True)
+            match = re.search(r"(\d+)", shown)
+            if match:
+                prev = match.group(1)
+                gdb.execute(f"set remote memory-read-packet-size {size}",
+                            to_string=True)
+        except (gdb.error, RuntimeError):
+            prev = None
+
+        try:
+            buf = self.read_bytes(address, size)
+            if buf is not None:
+                _state.tables[(address, size)] = buf
+            return buf
+        finally:
+            if prev is not None:
+                try:
+                    gdb.execute(f"set remote memory-read-packet-size {prev}",
+                                to_string=True)
+                except (gdb.error, RuntimeError):
+                    pass
+
+    def read_frame(self, table_base):
+        """Read a 4 KiB page-table frame, served from the frame cache when hot"""
+        frame = _state.frames.get(table_base)
+        if frame is None:
+            # read_memory hands back a memoryview; keep it as-is rather
+            # than paying for a 4 KiB bytes copy. The cache reference
+            # keeps the underlying buffer alive.
+            frame = self.read_bytes(table_base, 4096)
+            if frame is None:
+                return None
+            _state.frames[table_base] = frame
+        return frame
+
+    def read_table_entry(self, table_base, index):
+        """Read one 64-bit entry out of a 4 KiB page-table frame
+
+        Reads the whole frame in one go (cached across invocations) so a
+        page-table walk costs at most one memory read per level instead of
+        one expression evaluation per entry.
+        """
+        frame = self.read_frame(table_base)
+        if frame is None:
+            return None
+        return struct.unpack_from("<Q", frame, index * 8)[0]
+
 
 class DumpPageTable(YomiGdbCommand):
     """Dump x86_64 page table entries
 
-    Usage: dump-pagetable [address]
+    Usage: dump-pagetable [--json] [address]
         address: Virtual address to translate (optional, uses current CR3 if not specified)
+        --json: Emit the result as a JSON document for scripting
 
     This command walks the 4-level page table hierarchy and displays:
     - PML4 (Page Map Level 4)
@@ -62,180 +337,204 @@ class DumpPageTable(YomiGdbCommand):
     def __init__(self):
         super().__init__("dump-pagetable", gdb.COMMAND_USER)
 
-    def invoke(self, arg, from_tty):
+    def run(self, arg, out):
         args = gdb.string_to_argv(arg)
+        as_json = "--json" in args
+        if as_json:
+            args.remove("--json")
 
-        # Get CR3 register value (physical address of PML4)
-        try:
-            cr3_value = int(gdb.parse_and_eval("$cr3"))
-        except gdb.error:
-            print("Error: Cannot read CR3 register")
-            return
+        # Get CR3 register value (physical address of PML4), cached per stop
+        if _state.cr3 is None:
+            try:
+                _state.cr3 = int(gdb.parse_and_eval("$cr3"))
+            except gdb.error:
+                out.append("Error: Cannot read CR3 register")
+                return
+        cr3_value = _state.cr3
 
         # Mask off lower 12 bits to get page table base
         pml4_base = cr3_value & ~0xFFF
 
-        print("=" * 80)
-        print(f"Page Table Walk (CR3: {cr3_value:#018x})")
-        print(f"PML4 Base: {pml4_base:#018x}")
-        print("=" * 80)
+        if as_json:
+            self.dump_json(pml4_base, cr3_value, args, out)
+            return
+
+        out.append("=" * 80)
+        out.append(f"Page Table Walk (CR3: {cr3_value:#018x})")
+        out.append(f"PML4 Base: {pml4_base:#018x}")
+        out.append("=" * 80)
 
         if len(args) > 0:
             try:
                 virt_addr = int(args[0], 0)
-                self.walk_page_table(pml4_base, virt_addr)
+                self.walk_page_table(pml4_base, virt_addr, out)
             except ValueError:
-                print(f"Error: Invalid address '{args[0]}'")
+                out.append(f"Error: Invalid address '{args[0]}'")
         else:
             # Dump first few PML4 entries
-            self.dump_pml4_entries(pml4_base, 16)
-
-    def walk_page_table(self, pml4_base, virt_addr):
-        """Walk page table for a specific virtual address"""
-        print(f"\nTranslating virtual address: {virt_addr:#018x}")
-        print("-" * 80)
-
-        # Extract page table indices from virtual address
-        pml4_index = (virt_addr >> 39) & 0x1FF
-        pdpt_index = (virt_addr >> 30) & 0x1FF
-        pd_index = (virt_addr >> 21) & 0x1FF
-        pt_index = (virt_addr >> 12) & 0x1FF
-        offset = virt_addr & 0xFFF
-
-        print(f"Indices: PML4[{pml4_index}] -> PDPT[{pdpt_index}] -> "
-              f"PD[{pd_index}] -> PT[{pt_index}] + {offset:#x}")
-        print()
-
-        # Read PML4 entry
-        pml4_entry_addr = pml4_base + (pml4_index * 8)
-        pml4_entry = self.read_u64(pml4_entry_addr)
-
-        if pml4_entry is None:
-            print("Error: Cannot read PML4 entry")
-            return
+            self.dump_pml4_entries(pml4_base, 16, out)
 
-        print(f"PML4[{pml4_index}] @ {pml4_entry_addr:#018x}: {pml4_entry:#018x}")
-        self.print_page_entry_flags(pml4_entry)
+    def dump_json(self, pml4_base, cr3_value, args, out):
+        """Emit the walk or PML4 dump as one JSON document
 
-        if not (pml4_entry & 0x1):
-            print("  → Page not present")
-            return
-
-        # Read PDPT entry
-        pdpt_base = pml4_entry & ~0xFFF
-        pdpt_entry_addr = pdpt_base + (pdpt_index * 8)
-        pdpt_entry = self.read_u64(pdpt_entry_addr)
-
-        if pdpt_entry is None:
-            print("Error: Cannot read PDPT entry")
-            return
-
-        print(f"PDPT[{pdpt_index}] @ {pdpt_entry_addr:#018x}: {pdpt_entry:#018x}")
-        self.print_page_entry_flags(pdpt_entry)
-
-        if not (pdpt_entry & 0x1):
-            print("  → Page not present")
-            return
-
-        # Check for 1GB page
-        if pdpt_entry & 0x80:
-            phys_addr = (pdpt_entry & ~0x3FFFFFFF) | (virt_addr & 0x3FFFFFFF)
-            print(f"  → 1GB page, physical address: {phys_addr:#018x}")
-            return
-
-        # Read PD entry
-        pd_base = pdpt_entry & ~0xFFF
-        pd_entry_addr = pd_base + (pd_index * 8)
-        pd_entry = self.read_u64(pd_entry_addr)
-
-        if pd_entry is None:
-            print("Error: Cannot read PD entry")
-            return
+        Addresses and entry values are rendered as 0x-prefixed hex strings
+        (via _hex64) so consumers get fixed-width values without paying
+        for Python-level formatting here.
+        """
+        result = {"cr3": _hex64(cr3_value), "pml4_base": _hex64(pml4_base)}
 
-        print(f"PD[{pd_index}] @ {pd_entry_addr:#018x}: {pd_entry:#018x}")
-        self.print_page_entry_flags(pd_entry)
-
-        if not (pd_entry & 0x1):
-            print("  → Page not present")
-            return
+        if len(args) > 0:
+            try:
+                virt_addr = int(args[0], 0)
+            except ValueError:
+                result["error"] = f"Invalid address '{args[0]}'"
+            else:
+                walk = self.translate(pml4_base, virt_addr)
+                walk["virtual_address"] = _hex64(virt_addr)
+                for record in walk["levels"]:
+                    record["address"] = _hex64(record["address"])
+                    record["value"] = _hex64(record["value"])
+                if "physical_address" in walk:
+                    walk["physical_address"] = _hex64(walk["physical_address"])
+                result.update(walk)
+        else:
+            entries = self.read_u64_array(pml4_base, 16)
+            if entries is None:
+                result["error"] = "Cannot read PML4 entries"
+            else:
+                seen = {}
+                records = []
+                for i, entry in enumerate(entries):
+                    if not (entry & 0x1):
+                        continue
+                    record = {"index": i, "value": _hex64(entry),
+                              "flags": [n for m, n in _PTE_FLAGS if entry & m],
+                              "present": True}
+                    pdpt_base = entry & ~0xFFF
+                    first = seen.setdefault(pdpt_base, i)
+                    if first != i:
+                        record["same_table_as"] = first
+                    records.append(record)
+                result["entries"] = records
+
+        out.append(json.dumps(result))
+
+    def translate(self, pml4_base, virt_addr):
+        """Walk the page tables for virt_addr and return a structured result
+
+        Returns a dict with the per-level entries seen during the walk
+        and, when the address is mapped, the physical address and page
+        size. Both output modes render from this.
+        """
+        result = {"virtual_address": virt_addr, "levels": []}
+
+        base = pml4_base
+        for name, shift, page_mask, page_size in _PT_LEVELS:
+            index = (virt_addr >> shift) & 0x1FF
+            entry = self.read_table_entry(base, index)
 
-        # Check for 2MB page
-        if pd_entry & 0x80:
-            phys_addr = (pd_entry & ~0x1FFFFF) | (virt_addr & 0x1FFFFF)
-            print(f"  → 2MB page, physical address: {phys_addr:#018x}")
-            return
+            if entry is None:
+                result["error"] = f"Cannot read {name} entry"
+                return result
+
+            # Check the present bit before anything else: a non-present
+            # entry has no meaningful flags, so skip building them.
+            present = bool(entry & 0x1)
+            result["levels"].append({
+                "level": name,
+                "index": index,
+                "address": base + (index * 8),
+                "value": entry,
+                "flags": [n for m, n in _PTE_FLAGS if entry & m] if present else [],
+                "present": present,
+            })
+
+            if not present:
+                return result
+
+            # Check for a huge page (1GB at PDPT, 2MB at PD)
+            if page_mask is not None and entry & 0x80:
+                result["physical_address"] = ((entry & ~page_mask)
+                                              | (virt_addr & page_mask))
+                result["page_size"] = page_size
+                return result
+
+            base = entry & ~0xFFF
+
+        result["physical_address"] = base | (virt_addr & 0xFFF)
+        result["page_size"] = "4KB"
+        return result
+
+    def walk_page_table(self, pml4_base, virt_addr, out):
+        """Walk page table for a specific virtual address"""
+        out.append(f"\nTranslating virtual address: {virt_addr:#018x}")
+        out.append("-" * 80)
 
-        # Read PT entry
-        pt_base = pd_entry & ~0xFFF
-        pt_entry_addr = pt_base + (pt_index * 8)
-        pt_entry = self.read_u64(pt_entry_addr)
+        # Extract page table indices from virtual address
+        indices = [(virt_addr >> shift) & 0x1FF for _, shift, _, _ in _PT_LEVELS]
+        offset = virt_addr & 0xFFF
 
-        if pt_entry is None:
-            print("Error: Cannot read PT entry")
-            return
+        out.append("Indices: "
+                   + " -> ".join(f"{level[0]}[{index}]"
+                                 for level, index in zip(_PT_LEVELS, indices))
+                   + f" + {offset:#x}")
+        out.append("")
+
+        result = self.translate(pml4_base, virt_addr)
+
+        for record in result["levels"]:
+            out.append(f"{record['level']}[{record['index']}] @ "
+                       f"{record['address']:#018x}: {record['value']:#018x}")
+            if not record["present"]:
+                out.append("  → Page not present")
+            else:
+                out.append(f"  Flags: [{' | '.join(record['flags']) or 'None'}]")
+
+        if "error" in result:
+            out.append(f"Error: {result['error']}")
+        elif "physical_address" in result:
+            out.append(f"  → {result['page_size']} page, "
+                       f"physical address: {result['physical_address']:#018x}")
+
+    def dump_pml4_entries(self, pml4_base, count, out):
+        """Dump first N PML4 entries"""
+        out.append(f"\nFirst {count} PML4 entries:")
+        out.append("-" * 80)
 
-        print(f"PT[{pt_index}] @ {pt_entry_addr:#018x}: {pt_entry:#018x}")
-        self.print_page_entry_flags(pt_entry)
+        entries = self.read_u64_array(pml4_base, count)
 
-        if not (pt_entry & 0x1):
-            print("  → Page not present")
+        if entries is None:
+            out.append("Error: Cannot read PML4 entries")
             return
 
-        # Calculate final physical address
-        phys_addr = (pt_entry & ~0xFFF) | offset
-        print(f"  → 4KB page, physical address: {phys_addr:#018x}")
-
-    def dump_pml4_entries(self, pml4_base, count):
-        """Dump first N PML4 entries"""
-        print(f"\nFirst {count} PML4 entries:")
-        print("-" * 80)
+        # Filter on the present bit up front so only mapped slots ever
+        # reach the formatting code.
+        present = [(i, entry) for i, entry in enumerate(entries) if entry & 0x1]
 
-        for i in range(count):
+        # Many PML4 slots commonly alias the same PDPT (direct-map
+        # regions, for instance); back-reference the first occurrence
+        # instead of describing the same table again.
+        seen = {}
+        for i, entry in present:
             entry_addr = pml4_base + (i * 8)
-            entry = self.read_u64(entry_addr)
+            writable = bool(entry & 0x2)
+            user = bool(entry & 0x4)
+            no_execute = bool(entry & 0x8000000000000000)
+            out.append(f"PML4[{i:3d}] @ {entry_addr:#018x}: {entry:#018x} "
+                       f"[P:True W:{writable} U:{user} NX:{no_execute}]")
 
-            if entry is None:
-                print(f"PML4[{i:3d}]: Error reading memory")
-                continue
-
-            if entry & 0x1:  # Present bit
-                print(f"PML4[{i:3d}] @ {entry_addr:#018x}: {entry:#018x} "
-                      f"[P:{(entry & 0x1) != 0} W:{(entry & 0x2) != 0} "
-                      f"U:{(entry & 0x4) != 0} NX:{(entry & 0x8000000000000000) != 0}]")
-
-    @staticmethod
-    def print_page_entry_flags(entry):
-        """Print page table entry flags"""
-        flags = []
-        if entry & 0x1:
-            flags.append("P")  # Present
-        if entry & 0x2:
-            flags.append("W")  # Writable
-        if entry & 0x4:
-            flags.append("U")  # User
-        if entry & 0x8:
-            flags.append("PWT")  # Write-Through
-        if entry & 0x10:
-            flags.append("PCD")  # Cache Disable
-        if entry & 0x20:
-            flags.append("A")  # Accessed
-        if entry & 0x40:
-            flags.append("D")  # Dirty
-        if entry & 0x80:
-            flags.append("PS")  # Page Size
-        if entry & 0x100:
-            flags.append("G")  # Global
-        if entry & 0x8000000000000000:
-            flags.append("NX")  # No Execute
-
-        print(f"  Flags: [{' | '.join(flags) if flags else 'None'}]")
+            pdpt_base = entry & ~0xFFF
+            first = seen.setdefault(pdpt_base, i)
+            if first != i:
+                out.append(f"  → same PDPT as PML4[{first}]")
 
 
 class DumpIDT(YomiGdbCommand):
     """Dump Interrupt Descriptor Table (IDT)
 
-    Usage: dump-idt [count]
+    Usage: dump-idt [--json] [count]
         count: Number of IDT entries to display (default: 256)
+        --json: Emit the present entries as a JSON document for scripting
 
     This command displays the IDT entries, showing:
     - Entry number
@@ -244,162 +543,186 @@ class DumpIDT(YomiGdbCommand):
     - Gate type
     - DPL (Descriptor Privilege Level)
     - Present flag
+
+    The table is fetched with a single bulk read; on remote targets the
+    memory-read packet size is temporarily raised (and then restored) so
+    the full table travels in one packet.
     """
 
     def __init__(self):
         super().__init__("dump-idt", gdb.COMMAND_USER)
 
-    def invoke(self, arg, from_tty):
+    def run(self, arg, out):
         args = gdb.string_to_argv(arg)
+        as_json = "--json" in args
+        if as_json:
+            args.remove("--json")
         count = int(args[0]) if len(args) > 0 else 256
 
-        # Get IDTR (IDT register)
-        try:
-            # Read IDTR - this is a 10-byte structure (2 bytes limit + 8 bytes base)
-            idtr_output = gdb.execute("info registers idtr", to_string=True)
-
-            # Parse IDTR output
-            # Format: idtr           {base=0x..., limit=0x...}
-            import re
-            match = re.search(r'base=(0x[0-9a-fA-F]+).*limit=(0x[0-9a-fA-F]+)', idtr_output)
-
-            if not match:
-                print("Error: Cannot parse IDTR")
-                print(f"IDTR output: {idtr_output}")
-                return
-
-            idt_base = int(match.group(1), 16)
-            idt_limit = int(match.group(2), 16)
-
-        except gdb.error as e:
-            print(f"Error reading IDTR: {e}")
+        # Get IDTR (IDT register) - a 10-byte structure (2 bytes limit + 8 bytes base)
+        dtr = self.read_dtr("idtr", out)
+        if dtr is None:
             return
+        idt_base, idt_limit = dtr
 
         max_entries = min(count, (idt_limit + 1) // 16)
 
-        print("=" * 80)
-        print(f"Interrupt Descriptor Table (IDT)")
-        print(f"Base: {idt_base:#018x}, Limit: {idt_limit:#06x}")
-        print(f"Max entries: {max_entries}")
-        print("=" * 80)
+        if not as_json:
+            out.append("=" * 80)
+            out.append(f"Interrupt Descriptor Table (IDT)")
+            out.append(f"Base: {idt_base:#018x}, Limit: {idt_limit:#06x}")
+            out.append(f"Max entries: {max_entries}")
+            out.append("=" * 80)
 
-        for i in range(max_entries):
-            self.print_idt_entry(idt_base, i)
+        # Read the whole table once: one remote round-trip instead of one
+        # per entry.
+        buf = self.read_table_bytes(idt_base, max_entries * 16)
 
-    def print_idt_entry(self, idt_base, index):
-        """Print a single IDT entry"""
-        entry_addr = idt_base + (index * 16)  # Each IDT entry is 16 bytes
-
-        # Read 16 bytes for IDT entry
-        entry_bytes = self.read_bytes(entry_addr, 16)
-
-        if entry_bytes is None:
-            print(f"IDT[{index:3d}]: Error reading memory")
+        if buf is None:
+            out.append("Error: Cannot read IDT")
             return
 
-        # Parse IDT entry structure
-        offset_low = struct.unpack("<H", entry_bytes[0:2])[0]
-        selector = struct.unpack("<H", entry_bytes[2:4])[0]
-        ist = entry_bytes[4] & 0x7
-        type_attr = entry_bytes[5]
-        offset_mid = struct.unpack("<H", entry_bytes[6:8])[0]
-        offset_high = struct.unpack("<I", entry_bytes[8:12])[0]
-
-        # Construct full offset
-        offset = (offset_high << 32) | (offset_mid << 16) | offset_low
+        # Work on a memoryview so neither the pre-scan stride nor the
+        # per-entry unpack_from copies the buffer.
+        buf = memoryview(buf)
+        # Pre-scan the present bit (bit 7 of the type_attr byte at offset 5
+        # of each 16-byte gate) so absent entries are skipped without
+        # unpacking all six fields.
+        present_idxs = [i for i, t in enumerate(buf[5::16]) if t & 0x80]
+
+        if as_json:
+            entries = []
+            for i in present_idxs:
+                offset, selector, gate_type_name, dpl, ist = \
+                    _parse_idt_entry(buf, i)
+                entries.append({"index": i, "offset": _hex64(offset),
+                                "selector": selector, "type": gate_type_name,
+                                "dpl": dpl, "ist": ist, "present": True})
+            out.append(json.dumps({"base": _hex64(idt_base), "limit": idt_limit,
+                                   "entries": entries}))
+            return
 
-        # Parse type and attributes
-        present = (type_attr & 0x80) != 0
-        dpl = (type_attr >> 5) & 0x3
-        gate_type = type_attr & 0xF
+        for i in present_idxs:
+            self.print_idt_entry(buf, i, out)
 
-        gate_type_names = {
-            0xE: "Interrupt",
-            0xF: "Trap",
-        }
-        gate_type_name = gate_type_names.get(gate_type, f"Unknown({gate_type:#x})")
+    def print_idt_entry(self, buf, index, out):
+        """Append a single present IDT entry parsed out of the bulk-read table"""
+        offset, selector, gate_type_name, dpl, ist = _parse_idt_entry(buf, index)
 
-        if present and offset != 0:
-            print(f"IDT[{index:3d}]: {offset:#018x} "
-                  f"(Selector: {selector:#06x}, Type: {gate_type_name}, "
-                  f"DPL: {dpl}, IST: {ist}, P: {present})")
+        if offset != 0:
+            out.append(f"IDT[{index:3d}]: {offset:#018x} "
+                       f"(Selector: {selector:#06x}, Type: {gate_type_name}, "
+                       f"DPL: {dpl}, IST: {ist}, P: True)")
 
 
 class DumpGDT(YomiGdbCommand):
     """Dump Global Descriptor Table (GDT)
 
-    Usage: dump-gdt [count]
+    Usage: dump-gdt [--json] [count]
         count: Number of GDT entries to display (default: 16)
+        --json: Emit the present descriptors as a JSON document for scripting
+
+    The table is fetched with a single bulk read; on remote targets the
+    memory-read packet size is temporarily raised (and then restored) for
+    the duration of the read.
     """
 
     def __init__(self):
         super().__init__("dump-gdt", gdb.COMMAND_USER)
 
-    def invoke(self, arg, from_tty):
+    def run(self, arg, out):
         args = gdb.string_to_argv(arg)
+        as_json = "--json" in args
+        if as_json:
+            args.remove("--json")
         count = int(args[0]) if len(args) > 0 else 16
 
         # Get GDTR
-        try:
-            gdtr_output = gdb.execute("info registers gdtr", to_string=True)
-
-            import re
-            match = re.search(r'base=(0x[0-9a-fA-F]+).*limit=(0x[0-9a-fA-F]+)', gdtr_output)
-
-            if not match:
-                print("Error: Cannot parse GDTR")
-                return
-
-            gdt_base = int(match.group(1), 16)
-            gdt_limit = int(match.group(2), 16)
-
-        except gdb.error as e:
-            print(f"Error reading GDTR: {e}")
+        dtr = self.read_dtr("gdtr", out)
+        if dtr is None:
             return
+        gdt_base, gdt_limit = dtr
 
         max_entries = min(count, (gdt_limit + 1) // 8)
 
-        print("=" * 80)
-        print(f"Global Descriptor Table (GDT)")
-        print(f"Base: {gdt_base:#018x}, Limit: {gdt_limit:#06x}")
-        print(f"Max entries: {max_entries}")
-        print("=" * 80)
-
-        for i in range(max_entries):
-            self.print_gdt_entry(gdt_base, i)
+        if not as_json:
+            out.append("=" * 80)
+            out.append(f"Global Descriptor Table (GDT)")
+            out.append(f"Base: {gdt_base:#018x}, Limit: {gdt_limit:#06x}")
+            out.append(f"Max entries: {max_entries}")
+            out.append("=" * 80)
 
-    def print_gdt_entry(self, gdt_base, index):
-        """Print a single GDT entry"""
-        entry_addr = gdt_base + (index * 8)
-        entry = self.read_u64(entry_addr)
+        # Read the whole table once: one remote round-trip instead of one
+        # per descriptor.
+        buf = self.read_table_bytes(gdt_base, max_entries * 8)
 
-        if entry is None:
-            print(f"GDT[{index:3d}]: Error reading memory")
+        if buf is None:
+            out.append("Error: Cannot read GDT")
             return
 
-        if entry == 0:
-            if index == 0:
-                print(f"GDT[{index:3d}]: NULL descriptor")
+        entries = struct.unpack(f"<{max_entries}Q", buf)
+
+        if as_json:
+            records = [
+                {"index": i, "value": _hex64(entry),
+                 "dpl": (entry >> 45) & 0x3, "type": (entry >> 40) & 0xF,
+                 "present": True}
+                for i, entry in enumerate(entries) if entry & (1 << 47)
+            ]
+            out.append(json.dumps({"base": _hex64(gdt_base), "limit": gdt_limit,
+                                   "entries": records}))
             return
 
+        if max_entries > 0 and entries[0] == 0:
+            out.append(f"GDT[{0:3d}]: NULL descriptor")
+
+        # Pre-filter on the present bit (bit 47) so absent descriptors are
+        # skipped without any field decoding.
+        for i, entry in enumerate(entries):
+            if entry & (1 << 47):
+                self.print_gdt_entry(entry, i, out)
+
+    def print_gdt_entry(self, entry, index, out):
+        """Append a single present GDT descriptor from the bulk-read table"""
         # Parse descriptor
-        present = (entry >> 47) & 0x1
         dpl = (entry >> 45) & 0x3
         desc_type = (entry >> 44) & 0x1
         segment_type = (entry >> 40) & 0xF
 
-        if present:
-            print(f"GDT[{index:3d}]: {entry:#018x} "
-                  f"(DPL: {dpl}, Type: {segment_type:#x}, P: {present != 0})")
+        out.append(f"GDT[{index:3d}]: {entry:#018x} "
+                   f"(DPL: {dpl}, Type: {segment_type:#x}, P: True)")
+
+
+class _LazyCommand(gdb.Command):
+    """Register a command name now, build the implementation on first use
+
+    Keeps source-ing this file from .gdbinit cheap: the real command
+    classes are only constructed when first invoked. Constructing the
+    real class re-registers its name with GDB, so the dispatcher replaces
+    itself after the first call.
+    """
+
+    def __init__(self, name, factory):
+        # GDB takes the help text from __doc__ at registration time, so
+        # expose the real command's usage documentation rather than this
+        # dispatcher's; it must be in place before super().__init__.
+        self.__doc__ = factory.__doc__
+        super().__init__(name, gdb.COMMAND_USER)
+        self._factory = factory
+
+    def invoke(self, arg, from_tty):
+        self._factory().invoke(arg, from_tty)
 
 
 # Register all commands
-DumpPageTable()
-DumpIDT()
-DumpGDT()
-
-print("[GDB] Yomi OS kernel debugging helpers loaded")
-print("[GDB] Available commands:")
-print("  dump-pagetable [address] - Dump page table hierarchy")
-print("  dump-idt [count]         - Dump Interrupt Descriptor Table")
-print("  dump-gdt [count]         - Dump Global Descriptor Table")
+_LazyCommand("dump-pagetable", DumpPageTable)
+_LazyCommand("dump-idt", DumpIDT)
+_LazyCommand("dump-gdt", DumpGDT)
+
+# Keep startup quiet by default; `set verbose on` restores the banner.
+if gdb.parameter("verbose"):
+    print("[GDB] Yomi OS kernel debugging helpers loaded")
+    print("[GDB] Available commands:")
+    print("  dump-pagetable [address] - Dump page table hierarchy")
+    print("  dump-idt [count]         - Dump Interrupt Descriptor Table")
+    print("  dump-gdt [count]         - Dump Global Descriptor Table")